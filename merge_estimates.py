@@ -1,11 +1,53 @@
+import numpy as np
 import pandas as pd
 from pathlib import Path
 from openpyxl import load_workbook
-from openpyxl.utils import get_column_letter
 import os
 import subprocess
 import platform
 import json
+import sys
+import hashlib
+import datetime
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:  # Fall back to openpyxl's read-only reader
+    CalamineWorkbook = None
+
+try:
+    import ahocorasick
+except ImportError:  # Fall back to a plain substring scan
+    ahocorasick = None
+
+try:
+    import polars as pl
+    import pyarrow  # noqa: F401  (needed by polars' to_pandas)
+    FAST_CSV = True
+except ImportError:  # Fall back to pandas' CSV reader
+    FAST_CSV = False
+
+try:
+    from numba import njit
+except ImportError:  # Fall back to a regex for messy Unit Cost values
+    njit = None
+
+try:
+    import pyarrow  # noqa: F401  (Parquet engine for pandas)
+    PARQUET = True
+except ImportError:  # Parquet caching is skipped
+    PARQUET = False
+
+# pd.read_csv's default missing-value markers, so polars treats them the same
+CSV_NA_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None",
+    "n/a", "nan", "null",
+]
+
+# Bump when the cleaning logic changes so old cache entries are not reused
+CACHE_VERSION = 1
 
 
 # -----------------------------
@@ -16,6 +58,8 @@ import json
 # Features:
 # - Automatic category detection using categories.json
 # - Standardizes column names and cleans Unit Cost
+# - Reads input files in parallel
+# - Caches cleaned input files in the input folder's .cache/ between runs
 # - Removes duplicate items
 # - Supports Overwrite and Append modes
 # - Auto-resizes Excel columns
@@ -25,23 +69,84 @@ import json
 # -----------------------------
 # Helper Functions
 # -----------------------------
-def auto_adjust_column_width(file_path):
+def save_master_file(df, file_path, sample_rows=5000, max_width=60):
     """
-    Auto-adjust the width of all columns in an Excel file to fit content.
+    Writes the master dataframe to Excel in a single pass, with each column
+    sized to fit its longest value (or header).
+    Widths are estimated from the first rows only, so large master files
+    are not scanned in full. A Parquet copy is written next to the Excel
+    file so append mode can reload it quickly.
 
     Parameters:
+        df (pd.DataFrame): Dataframe to save
         file_path (str): Path to the Excel file.
+        sample_rows (int): Number of rows used to estimate column widths
+        max_width (int): Upper limit for a column width in characters
     """
-    wb = load_workbook(file_path)
-    ws = wb.active
+    sample = df.head(sample_rows)
+    widths = {}
+    for col in df.columns:
+        lengths = sample[col].astype(str).str.len().fillna(0)
+        longest = int(lengths.max()) if len(lengths) else 0
+        widths[col] = min(max_width, max(longest, len(col))) + 2
 
-    for column_cells in ws.columns:
-        length = max(len(str(cell.value)) if cell.value else 0 for cell in column_cells)
-        adjusted_width = length + 2
-        ws.column_dimensions[get_column_letter(column_cells[0].column)].width = adjusted_width
+    with pd.ExcelWriter(file_path, engine="xlsxwriter") as writer:
+        df.to_excel(writer, index=False)
+        ws = writer.sheets["Sheet1"]
+        for i, col in enumerate(df.columns):
+            ws.set_column(i, i, widths[col])
 
-    wb.save(file_path)
-    print(f"✅ Auto-adjusted column widths in {file_path}")
+    if PARQUET:
+        save_parquet_copy(df, Path(file_path).with_suffix(".parquet"))
+
+    print(f"✅ Master spreadsheet saved: {file_path}")
+
+
+def save_parquet_copy(df, sidecar):
+    """
+    Writes the Parquet copy of the master file used by append mode.
+    Mixed-type text columns (e.g. numeric descriptions added by hand in
+    Excel) are converted to str first. The copy is written to a temp file
+    and renamed; if it still cannot be written, any old copy is removed so
+    append mode falls back to the Excel file instead of stale data.
+
+    Parameters:
+        df (pd.DataFrame): Master dataframe
+        sidecar (Path): Path of the Parquet copy
+    """
+    parquet_df = df.copy(deep=False)
+    for col in parquet_df.columns:
+        values = parquet_df[col]
+        if values.dtype == object and not pd.api.types.is_string_dtype(values):
+            parquet_df[col] = values.where(values.isna(), values.astype(str))
+
+    tmp = sidecar.with_suffix(".tmp")
+    try:
+        parquet_df.to_parquet(tmp, index=False)
+        tmp.replace(sidecar)
+    except (pyarrow.ArrowException, ValueError, TypeError, OSError) as e:
+        tmp.unlink(missing_ok=True)
+        sidecar.unlink(missing_ok=True)
+        print(f"⚠️ Could not write {sidecar.name}: {e}")
+
+
+def load_master_file(file_path):
+    """
+    Loads an existing master file for append mode.
+    Reads the Parquet copy written by save_master_file when it is present
+    and not older than the Excel file, otherwise reads the Excel file.
+
+    Parameters:
+        file_path (str): Path to the Excel file.
+
+    Returns:
+        pd.DataFrame: Existing master items
+    """
+    excel_file = Path(file_path)
+    sidecar = excel_file.with_suffix(".parquet")
+    if PARQUET and sidecar.exists() and sidecar.stat().st_mtime >= excel_file.stat().st_mtime:
+        return pd.read_parquet(sidecar)
+    return pd.read_excel(excel_file)
 
 
 def open_master_file(file_path):
@@ -63,21 +168,175 @@ def open_master_file(file_path):
         print(f"⚠️ Could not open file: {e}")
 
 
-def detect_category(filename, categories):
+def read_csv_file(file_path):
+    """
+    Reads a CSV file into a pandas dataframe.
+    Uses polars' multithreaded parser when polars and pyarrow are installed,
+    otherwise pandas. Polars uses pandas' missing-value markers and drops
+    extra trailing fields. Files that polars cannot parse or convert, and
+    files with blank or all-empty rows, are read by pandas instead, so the
+    result does not depend on which reader is installed.
+
+    Parameters:
+        file_path (Path): Path to the CSV file.
+
+    Returns:
+        pd.DataFrame: File contents
+    """
+    if FAST_CSV:
+        try:
+            df = pl.read_csv(
+                file_path,
+                infer_schema_length=None,
+                truncate_ragged_lines=True,
+                null_values=CSV_NA_VALUES,
+            )
+            # pandas skips blank lines but keeps ",," rows; polars reads both
+            # as all-null rows, so let pandas handle such files
+            if df.select(pl.all_horizontal(pl.all().is_null()).any()).item():
+                return pd.read_csv(file_path)
+            return df.to_pandas()
+        except (pl.exceptions.PolarsError, pyarrow.ArrowException):
+            return pd.read_csv(file_path)
+    return pd.read_csv(file_path)
+
+
+def read_excel_file(file_path):
+    """
+    Reads the first sheet of an Excel file into a dataframe.
+    Uses python-calamine when installed, otherwise openpyxl in read-only mode.
+    The first row is used as the header and blank rows are skipped.
+    If the header lacks the required columns, no dataframe is built for
+    the body; with the openpyxl fallback the body is not read at all
+    (calamine loads the whole sheet up front).
+
+    Parameters:
+        file_path (Path): Path to the Excel file.
+
+    Returns:
+        pd.DataFrame: Sheet contents
+    """
+    if CalamineWorkbook is not None:
+        wb = CalamineWorkbook.from_path(str(file_path))
+        return rows_to_dataframe(wb.get_sheet_by_index(0).to_python())
+
+    wb = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        return rows_to_dataframe(wb.worksheets[0].iter_rows(values_only=True))
+    finally:
+        wb.close()
+
+
+def rows_to_dataframe(rows):
+    """
+    Builds a dataframe from sheet rows, using the first non-blank row as
+    the header. Rows are consumed lazily, so with a streaming reader the
+    body of a sheet without the required columns is never parsed.
+    Cells are normalized so calamine and openpyxl give the same frame:
+    empty strings become None and whole-number floats become int (as
+    pd.read_excel does), so a part number 42 stays "42" rather than "42.0".
+
+    Parameters:
+        rows (iterable): Sheet rows as sequences of cell values
+
+    Returns:
+        pd.DataFrame: Sheet contents, or only its header if unusable
+    """
+    rows = ([normalize_cell(value) for value in row] for row in rows)
+    rows = (row for row in rows if any(value is not None for value in row))
+    header = next(rows, None)
+    if header is None:
+        return pd.DataFrame()
+
+    header = ["" if value is None else str(value) for value in header]
+    if not has_required_columns(header):
+        return pd.DataFrame(columns=header)
+    return pd.DataFrame(list(rows), columns=header)
+
+
+def normalize_cell(value):
+    """
+    Maps an Excel cell value to what pd.read_excel would give for it.
+
+    Parameters:
+        value: Raw cell value from calamine or openpyxl
+
+    Returns:
+        The value, with "" as None, whole-number floats as int and
+        dates as pd.Timestamp
+    """
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str) and value == "":
+        return None
+    if isinstance(value, datetime.date):
+        # calamine gives datetime.date for date-only cells
+        return pd.Timestamp(value)
+    return value
+
+
+def read_csv_header(file_path):
+    """
+    Reads only the column names of a CSV file, without parsing the body.
+
+    Parameters:
+        file_path (Path): Path to the CSV file.
+
+    Returns:
+        list: Column names
+    """
+    return list(pd.read_csv(file_path, nrows=0).columns)
+
+
+def build_category_matcher(categories):
+    """
+    Builds an Aho-Corasick automaton over all category keywords so a
+    filename can be matched against every keyword in a single scan.
+
+    Parameters:
+        categories (dict): Dictionary of category -> tuple of lowercase keywords.
+
+    Returns:
+        ahocorasick.Automaton: The matcher, or None if pyahocorasick is
+        not installed or there are no keywords.
+    """
+    if ahocorasick is None:
+        return None
+
+    matcher = ahocorasick.Automaton()
+    for rank, (category, keywords) in enumerate(categories.items()):
+        for keyword in keywords:
+            if keyword not in matcher:
+                matcher.add_word(keyword, (rank, category))
+
+    if len(matcher) == 0:
+        return None
+    matcher.make_automaton()
+    return matcher
+
+
+def detect_category(filename, categories, matcher=None):
     """
     Detects the category of a spreadsheet based on its filename
     using a JSON mapping of keywords.
+    When several categories match, the one listed first in the JSON wins.
 
     Parameters:
         filename (str): The stem of the filename (without extension).
-        categories (dict): Dictionary of category -> list of keywords.
+        categories (dict): Dictionary of category -> tuple of lowercase keywords.
+        matcher (ahocorasick.Automaton): Optional matcher from
+            build_category_matcher.
 
     Returns:
         str: The detected category or "Unknown" if no match.
     """
     name = filename.lower()
+    if matcher is not None:
+        matches = [match for _, match in matcher.iter(name)]
+        return min(matches)[1] if matches else "Unknown"
+
     for category, keywords in categories.items():
-        if any(keyword.lower() in name for keyword in keywords):
+        if any(keyword in name for keyword in keywords):
             return category
     return "Unknown"
 
@@ -85,9 +344,117 @@ def detect_category(filename, categories):
 # -----------------------------
 # Data Cleaning Functions
 # -----------------------------
+CURRENCY_CHARS = str.maketrans("", "", "$,€£ ")
+
+
+def clean_unit_cost(costs):
+    """
+    Converts a Unit Cost column to float.
+    Common "$1,234.56" style values are parsed directly; anything else
+    falls back to stripping all non-numeric characters. Blanks become 0.
+
+    Parameters:
+        costs (pd.Series): Raw Unit Cost values
+
+    Returns:
+        pd.Series: Unit Cost as float
+    """
+    if pd.api.types.is_numeric_dtype(costs):
+        return costs.fillna(0.0).astype(float)
+
+    text = costs.astype(str)
+    # Unlike stripping every non-digit, to_numeric keeps a leading minus
+    # sign and reads exponents ("-4" -> -4.0, "1e5" -> 100000.0). It also
+    # accepts "inf"/"Infinity", so non-finite results go to the fallback.
+    parsed = pd.to_numeric(text.str.translate(CURRENCY_CHARS), errors="coerce")
+
+    failed = ~np.isfinite(parsed)
+    if failed.any():
+        parsed[failed] = parse_messy_costs(text[failed])
+    return parsed.fillna(0.0).astype(float)
+
+
+def parse_messy_costs(text):
+    """
+    Parses Unit Cost strings such as "USD 1,234.56 / ea" by keeping only
+    digits and the decimal point. Uses a numba-compiled byte scanner when
+    numba is installed, otherwise a regex.
+
+    Parameters:
+        text (pd.Series): Unit Cost strings
+
+    Returns:
+        pd.Series: Parsed values, NaN where no number could be read
+    """
+    if njit is None:
+        return pd.to_numeric(text.str.replace("[^0-9.]", "", regex=True), errors="coerce")
+
+    encoded = [value.encode() if isinstance(value, str) else b"" for value in text]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    buffer = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    return pd.Series(parse_cost_bytes(buffer, offsets), index=text.index)
+
+
+def parse_cost_bytes(buffer, offsets):
+    """
+    Parses each span buffer[offsets[i]:offsets[i + 1]] as a number made of
+    its digits and decimal point, ignoring every other byte. Spans with no
+    digits or more than one decimal point give NaN.
+
+    Parameters:
+        buffer (np.ndarray): uint8 array of the encoded strings
+        offsets (np.ndarray): Start offset of each string, plus the end
+
+    Returns:
+        np.ndarray: float64 value per string
+    """
+    out = np.empty(len(offsets) - 1, dtype=np.float64)
+    for i in range(len(offsets) - 1):
+        mantissa = 0.0
+        digits = 0
+        decimals = 0
+        seen_dot = False
+        valid = True
+        for j in range(offsets[i], offsets[i + 1]):
+            c = buffer[j]
+            if 48 <= c <= 57:
+                mantissa = mantissa * 10.0 + (c - 48)
+                digits += 1
+                if seen_dot:
+                    decimals += 1
+            elif c == 46:
+                if seen_dot:
+                    valid = False
+                    break
+                seen_dot = True
+        out[i] = mantissa / 10.0 ** decimals if valid and digits > 0 else np.nan
+    return out
+
+
+if njit is not None:
+    parse_cost_bytes = njit(cache=True)(parse_cost_bytes)
+
+
+def has_required_columns(columns):
+    """
+    Checks that a file has a Description (or Item Description) and a
+    Unit Cost column, ignoring case and surrounding spaces.
+
+    Parameters:
+        columns (list): Column names
+
+    Returns:
+        bool: True if the file can be merged
+    """
+    names = {str(col).strip().lower() for col in columns}
+    has_description = "description" in names or "item description" in names
+    return has_description and "unit cost" in names
+
+
 def clean_dataframe(df, source_file, category):
     """
-    Standardizes a dataframe and logs processing info:
+    Standardizes a dataframe and reports processing info:
     - Renames "Item Description" to "Description"
     - Cleans Unit Cost to float
     - Adds category and source file columns
@@ -98,30 +465,152 @@ def clean_dataframe(df, source_file, category):
         category (str): Category name
 
     Returns:
-        pd.DataFrame: Cleaned dataframe or None if invalid
+        tuple: (Cleaned dataframe or None if invalid, log line)
     """
-    df.columns = df.columns.str.strip().str.lower()
+    if not has_required_columns(df.columns):
+        return None, f"⚠️ Skipping {source_file} — missing required columns."
+
+    df.columns = df.columns.astype(str).str.strip().str.lower()
     if "item description" in df.columns:
         df.rename(columns={"item description": "description"}, inplace=True)
 
-    if "description" not in df.columns or "unit cost" not in df.columns:
-        print(f"⚠️ Skipping {source_file} — missing required columns.")
-        return None
-
-    df["description"] = df["description"].astype(str).str.strip()
-    df["unit cost"] = (
-        df["unit cost"]
-        .astype(str)
-        .str.replace("[^0-9.]", "", regex=True)
-        .replace("", "0")
-        .astype(float)
-    )
+    description = df["description"]
+    if not pd.api.types.is_string_dtype(description):
+        description = description.astype(str)
+    df["description"] = description.str.strip()
+    df["unit cost"] = clean_unit_cost(df["unit cost"])
 
     df["category"] = category
     df["source file"] = source_file
 
-    print(f"📄 Processed '{source_file}' | Items read: {len(df)} | Category: {category}")
-    return df[["category", "description", "unit cost", "source file"]]
+    log_line = f"📄 Processed '{source_file}' | Items read: {len(df)} | Category: {category}"
+    return df[["category", "description", "unit cost", "source file"]], log_line
+
+
+def cache_path(file_path, category, cache_dir):
+    """
+    Returns the Parquet cache location for a cleaned input file.
+    The key covers CACHE_VERSION, the file path, modification time and
+    size, plus the detected category, so edited files, changed categories
+    or a new cleaning version miss the cache.
+
+    Parameters:
+        file_path (Path): CSV or XLSX input file
+        category (str): Category detected for the file
+        cache_dir (Path): Cache folder
+
+    Returns:
+        Path: Cache file inside cache_dir
+    """
+    stat = file_path.stat()
+    raw_key = (
+        f"v{CACHE_VERSION}:{file_path.resolve()}:{stat.st_mtime_ns}:{stat.st_size}:{category}"
+    )
+    key = hashlib.blake2b(raw_key.encode()).hexdigest()[:16]
+    return cache_dir / f"{key}.parquet"
+
+
+def prune_cache(cache_dir, used):
+    """
+    Deletes cache entries that were not used in this run, e.g. for input
+    files that were edited or removed, so the cache does not grow forever.
+    Entries that cannot be deleted (e.g. on a read-only share) are left.
+
+    Parameters:
+        cache_dir (Path): Cache folder
+        used (set): Cache paths belonging to the current input files
+    """
+    if not cache_dir.is_dir():
+        return
+    for entry in cache_dir.iterdir():
+        if entry.suffix in (".parquet", ".tmp") and entry not in used:
+            try:
+                entry.unlink(missing_ok=True)
+            except OSError:
+                pass
+
+
+def save_cache_entry(df_clean, cache):
+    """
+    Writes a cleaned frame to the cache through a temp file and rename.
+    The cache is only an optimization, so a folder that cannot be written
+    (read-only share, .cache existing as a file, ...) just skips caching.
+
+    Parameters:
+        df_clean (pd.DataFrame): Cleaned dataframe
+        cache (Path): Cache file from cache_path
+    """
+    tmp = cache.with_suffix(".tmp")
+    try:
+        cache.parent.mkdir(exist_ok=True)
+        df_clean.to_parquet(tmp, index=False)
+        tmp.replace(cache)
+    except (OSError, pyarrow.ArrowException):
+        try:
+            tmp.unlink(missing_ok=True)
+        except OSError:
+            pass
+
+
+def load_file(file_path, categories, matcher=None, cache_dir=None):
+    """
+    Reads and cleans a single input file.
+    Runs in a worker process, so it only takes picklable arguments.
+
+    Parameters:
+        file_path (Path): CSV or XLSX file to load
+        categories (dict): Dictionary of category -> tuple of lowercase keywords.
+        matcher (ahocorasick.Automaton): Optional keyword matcher
+        cache_dir (Path): Folder for cached cleaned files, or None to skip caching
+
+    Returns:
+        tuple: (Cleaned dataframe or None if invalid, log line)
+    """
+    category = detect_category(file_path.stem, categories, matcher)
+
+    cache = cache_path(file_path, category, cache_dir) if cache_dir is not None else None
+    if cache is not None and cache.exists():
+        try:
+            df_clean = pd.read_parquet(cache)
+        except (OSError, pyarrow.ArrowException):
+            df_clean = None  # Unreadable entry, parse the file again
+        if df_clean is not None:
+            log_line = f"📄 Loaded cached '{file_path.name}' | Items read: {len(df_clean)} | Category: {category}"
+            return df_clean, log_line
+
+    if file_path.suffix.lower() == ".csv":
+        # Check the header before parsing the whole file
+        header = read_csv_header(file_path)
+        if not has_required_columns(header):
+            return clean_dataframe(pd.DataFrame(columns=header), file_path.name, category)
+        df = read_csv_file(file_path)
+    else:
+        # read_excel_file checks the header itself before reading the body
+        df = read_excel_file(file_path)
+
+    df_clean, log_line = clean_dataframe(df, file_path.name, category)
+    if cache is not None and df_clean is not None:
+        save_cache_entry(df_clean, cache)
+    return df_clean, log_line
+
+
+def dedup_keys(df):
+    """
+    Builds a 64-bit duplicate key per row from the category and the
+    description, lowercased with whitespace collapsed.
+
+    Parameters:
+        df (pd.DataFrame): Dataframe with category and description columns
+
+    Returns:
+        pd.Series: uint64 key per row
+    """
+    description = df["description"]
+    if not pd.api.types.is_string_dtype(description):
+        description = description.astype(str)
+    normalized = description.str.lower().str.split().str.join(" ")
+    keys = pd.DataFrame({"category": df["category"], "normalized": normalized})
+    return pd.util.hash_pandas_object(keys, index=False)
 
 
 # -----------------------------
@@ -147,65 +636,96 @@ def merge_estimates(input_folder="input_files", output_file="master_items.xlsx",
         return
     with open(categories_file) as f:
         categories = json.load(f)
+    categories = {
+        category: tuple(keyword.lower() for keyword in keywords)
+        for category, keywords in categories.items()
+    }
+    matcher = build_category_matcher(categories)
 
     # Collect all CSV/XLSX files
-    all_files = [
-        f for f in input_path.iterdir()
-        if f.suffix.lower() in [".xlsx", ".csv"] and not f.name.startswith("~$")
-    ]
+    with os.scandir(input_path) as entries:
+        all_files = sorted(
+            Path(entry.path) for entry in entries
+            if entry.name.lower().endswith((".xlsx", ".csv"))
+            and not entry.name.startswith("~$")
+            and entry.is_file()
+        )
 
     if not all_files:
         print("⚠️ No input files found in folder:", input_folder)
         return
 
-    combined_data = []
+    cache_dir = input_path / ".cache" if PARQUET else None
+
+    columns = ["category", "description", "unit cost", "source file"]
+    combined_data = {col: [] for col in columns}
     total_files_processed = 0
     total_items_processed = 0
 
     # -----------------------------
     # Process Each File
     # -----------------------------
-    for file in all_files:
-        category = detect_category(file.stem, categories)
-
-        if file.suffix.lower() == ".csv":
-            df = pd.read_csv(file)
-        else:
-            df = pd.read_excel(file)
-
-        df_clean = clean_dataframe(df, file.name, category)
+    # Windows allows at most 61 worker processes
+    max_workers = min(len(all_files), os.cpu_count() or 1, 61)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(
+            load_file,
+            all_files,
+            [categories] * len(all_files),
+            [matcher] * len(all_files),
+            [cache_dir] * len(all_files),
+        ))
+
+    if cache_dir is not None:
+        prune_cache(cache_dir, {
+            cache_path(file, detect_category(file.stem, categories, matcher), cache_dir)
+            for file in all_files
+        })
+
+    logs = []
+    for df_clean, log_line in results:
+        logs.append(log_line)
         if df_clean is not None:
-            combined_data.append(df_clean)
+            for col in columns:
+                combined_data[col].append(df_clean[col].to_numpy())
             total_files_processed += 1
             total_items_processed += len(df_clean)
+    sys.stdout.write("\n".join(logs) + "\n")
 
-    if not combined_data:
+    if total_files_processed == 0:
         print("⚠️ No valid data found in provided files.")
         return
 
-    new_data = pd.concat(combined_data, ignore_index=True)
+    new_data = pd.DataFrame({col: np.concatenate(combined_data[col]) for col in columns})
+    new_data["category"] = new_data["category"].astype("category")
+    new_data["source file"] = new_data["source file"].astype("category")
+
+    # -----------------------------
+    # Remove Duplicates Within New Data
+    # -----------------------------
+    before_dedup = len(new_data)
+    new_keys = dedup_keys(new_data)
+    keep = ~new_keys.duplicated()
 
     # -----------------------------
     # Append or Overwrite Logic
     # -----------------------------
     if mode.lower() == "append" and Path(output_file).exists():
-        existing_df = pd.read_excel(output_file)
-        combined_df = pd.concat([existing_df, new_data], ignore_index=True)
+        existing_df = load_master_file(output_file)
+        before_dedup += len(existing_df)
+        keep &= ~new_keys.isin(dedup_keys(existing_df))
+        combined_df = pd.concat([existing_df, new_data[keep]], ignore_index=True)
+        combined_df["category"] = combined_df["category"].astype("category")
+        combined_df["source file"] = combined_df["source file"].astype("category")
         print("ℹ️ Append mode: Adding new unique items to existing master file.")
     else:
-        combined_df = new_data
+        combined_df = new_data[keep]
         if mode.lower() == "overwrite":
             print("ℹ️ Overwrite mode: Rebuilding master file from scratch.")
 
     # -----------------------------
-    # Remove Duplicates and Log
+    # Log Deduplication
     # -----------------------------
-    before_dedup = len(combined_df)
-    combined_df["normalized"] = (
-        combined_df["description"].str.lower().str.replace(r"\s+", " ", regex=True)
-    )
-    combined_df.drop_duplicates(subset=["category", "normalized"], inplace=True)
-    combined_df.drop(columns="normalized", inplace=True)
     after_dedup = len(combined_df)
     duplicates_removed = before_dedup - after_dedup
 
@@ -217,9 +737,7 @@ def merge_estimates(input_folder="input_files", output_file="master_items.xlsx",
     # -----------------------------
     # Save and Finalize
     # -----------------------------
-    combined_df.to_excel(output_file, index=False)
-    print(f"✅ Master spreadsheet saved: {output_file}")
-    auto_adjust_column_width(output_file)
+    save_master_file(combined_df, output_file)
     open_master_file(output_file)
 
 